@@ -22,7 +22,7 @@
 
 import sys
 
-from utils import to_sqf, log
+from utils import configure_logging, log, to_sqf
 
 
 def main() -> None:
@@ -39,16 +39,20 @@ def main() -> None:
     fileIn = sys.argv[1]
     fileOut = sys.argv[2]
 
-    log.info(f"{fileIn} -> {fileOut}")
-    with open(fileIn) as f:
-        source = f.read()
+    log.info("%s -> %s", fileIn, fileOut)
+    # Decode the input as UTF-8 in one go, whatever the locale encoding is.
+    # `ast` accepts any line endings, so no newline translation is needed.
+    with open(fileIn, "rb") as f:
+        source = f.read().decode("utf-8")
     result = to_sqf(source)
-    with open(fileOut, "w") as f:
+    # Text mode keeps the platform's line endings in the output.
+    with open(fileOut, "w", encoding="utf-8") as f:
         f.write(result)
     log.info("Success!")
 
 
 if __name__ == "__main__":
+    configure_logging()
     try:
         main()
     except Exception as e:
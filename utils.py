@@ -21,19 +21,36 @@
 # SOFTWARE.
 
 import ast
-from functools import singledispatch
-from logging import basicConfig, getLogger
-from string import Template
-
-from rich.logging import RichHandler
-
-basicConfig(
-    level="NOTSET",
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=True, tracebacks_show_locals=True)],
-)
+import sys
+from functools import lru_cache
+from logging import NullHandler, basicConfig, getLogger
+from typing import Callable
+
 log = getLogger("rich")
+# Stay quiet when used as a library; `configure_logging` turns output on.
+log.addHandler(NullHandler())
+
+
+def configure_logging() -> None:
+    # Imported here so that only the CLI pays for loading rich.
+    from rich.logging import RichHandler
+
+    # Rendering locals walks every frame of the traceback, and the translator's
+    # frames hold whole ASTs, so keep tracebacks rich but without locals.
+    basicConfig(
+        level="NOTSET",
+        format="%(message)s",
+        datefmt="[%X]",
+        handlers=[RichHandler(rich_tracebacks=True, tracebacks_show_locals=False)],
+    )
+
+
+# Keywords that show up all over the output share one interned object each.
+_NIL = sys.intern("nil")
+_TRUE = sys.intern("true")
+_FALSE = sys.intern("false")
+_BREAK = sys.intern("break;")
+_CONTINUE = sys.intern("continue;")
 
 
 def indenter(source: str) -> str:
@@ -41,78 +58,111 @@ def indenter(source: str) -> str:
     depth = 0
     lines: list[str] = []
 
+    # After the replacements "{" can only end a line and "}" can only start
+    # one, so checking the first and last character is enough. Empty lines
+    # are skipped here rather than collapsed with another full-string pass.
     for line in (
-        source.replace("{", "{\n")
-        .replace("}", "\n}")
-        .replace(";", ";\n")
-        .replace("\n\n", "\n")
-        .splitlines()
+        source.replace("{", "{\n").replace("}", "\n}").replace(";", ";\n").split("\n")
     ):
-        if "{" in line and "}" in line:
-            lines.append(indent * (depth - 1) + line)
-        elif "{" in line:
-            lines.append(indent * depth + line)
-            depth += 1
-        elif "}" in line:
-            depth -= 1
-            lines.append(indent * depth + line)
-        else:
+        if line:
+            if line[0] == "}":
+                depth -= 1
             lines.append(indent * depth + line)
+            if line[-1] == "{":
+                depth += 1
     return "\n".join(lines)
 
 
+# Python 3.13+ can fold constant expressions such as `60 * 60` while parsing,
+# which leaves fewer nodes to translate.
+_PARSE_FLAGS = ast.PyCF_ONLY_AST | getattr(ast, "PyCF_OPTIMIZED_AST", 0)
+
+
+# Unchanged sources (e.g. repeated builds) skip parsing and translation.
+@lru_cache(maxsize=32)
 def to_sqf(source: str) -> str:
-    module = ast.parse(source)
+    module = compile(source, "<unknown>", "exec", _PARSE_FLAGS, dont_inherit=True)
     result = translate(module)
     return indenter(result)
 
 
-@singledispatch
 def translate(node: ast.AST) -> str:
-    log.warning(f"Unsupported node: {node:r}!")
+    entry = TRANSLATORS.get(type(node))
+    if entry is None:
+        return _unsupported(node)
+    return entry if isinstance(entry, str) else entry(node)
+
+
+def _unsupported(node: ast.AST) -> str:
+    log.warning("Unsupported node: %r!", node)
     return ""
 
 
-@translate.register
-def _(node: ast.Module | ast.Interactive | ast.Expression) -> str:
-    return "".join(translate(child) for child in ast.iter_child_nodes(node))
+def _translate_module(node: ast.Module | ast.Interactive) -> str:
+    return "".join(map(translate, node.body))
 
 
-@translate.register
-def _(node: ast.FunctionType) -> str:
-    return ""
+def _translate_expression(node: ast.Expression) -> str:
+    return translate(node.body)
+
 
+# Translated literals keyed by `(type(value), value)` so that `1`, `1.0` and
+# `True` don't collide. The singletons are filled in up front; everything else
+# is added on first use, up to `_CONSTANTS_SIZE` entries.
+_CONSTANTS: dict[tuple[type, object], str] = {
+    (type(None), None): _NIL,
+    (bool, True): _TRUE,
+    (bool, False): _FALSE,
+    (type(Ellipsis), Ellipsis): "",
+}
+_CONSTANTS_SIZE = 4096
 
-@translate.register
-def _(node: ast.Constant) -> str:
+
+def _translate_constant(node: ast.Constant) -> str:
     # None, str, bytes, bool, int, float, complex, Ellipsis
-    if node.value is None:
-        return "nil"
-    if node.value is Ellipsis:
-        return ""
-    if isinstance(node.value, str):
-        return f'"{node.value}"'
-    if isinstance(node.value, bool):
-        return "true" if node.value else "false"
-    if isinstance(node.value, (int, float)):
+    if type(node.value) is tuple:
+        # Parsing with `PyCF_OPTIMIZED_AST` folds tuples of literals into a
+        # single constant. Not cached: equal tuples such as `(1, True)` and
+        # `(1, 1)` would share an entry.
+        elems = [_translate_constant(ast.Constant(elem)) for elem in node.value]
+        return f"[{', '.join(elems)}]"
+    if type(node.value) is float and node.value == 0:
+        # `0.0 == -0.0`, so keep signed zero out of the cache.
         return str(node.value)
-    log.warning(f"Unsupported constant: {node.value} is not supported!")
-    return ""
+    key = (type(node.value), node.value)
+    try:
+        return _CONSTANTS[key]
+    except KeyError:
+        pass
+
+    # `bool` is already in the table, so this only sees real numbers.
+    if isinstance(node.value, (int, float)):
+        value = str(node.value)
+    elif isinstance(node.value, str):
+        value = f'"{node.value}"'
+    else:
+        log.warning("Unsupported constant: %s is not supported!", node.value)
+        return ""
+    if len(_CONSTANTS) < _CONSTANTS_SIZE:
+        _CONSTANTS[key] = value
+    return value
 
 
-@translate.register
-def _(node: ast.FormattedValue) -> str:
+def _translate_formattedvalue(node: ast.FormattedValue) -> str:
     if node.conversion != -1 or node.format_spec is not None:
-        log.warning(f"Unsupported format string: value format is not supported!")
+        log.warning("Unsupported format string: value format is not supported!")
         return ""
     return translate(node.value)
 
 
-@translate.register
-def _(node: ast.JoinedStr) -> str:
+def _translate_joinedstr(node: ast.JoinedStr) -> str:
     # No need to format but is a f-string :(
-    if all(isinstance(value, ast.Constant) for value in node.values):
-        return "".join(value.value for value in node.values)  # type: ignore
+    try:
+        joined = "".join([value.value for value in node.values])  # type: ignore
+        return f'"{joined}"'
+    except TypeError:
+        # `ast.FormattedValue.value` is a node, not a `str`.
+        pass
 
     index = 1
     formatted_value: list[str] = []
@@ -120,7 +170,7 @@ def _(node: ast.JoinedStr) -> str:
     for value in node.values:
         if isinstance(value, ast.Constant):
             # The type of `value.value` is `str`
-            syntax.append(value.value)
+            syntax.append(value.value)  # type: ignore
         else:
             # The type of `value` is `ast.FormattedValue`
             formatted_value.append(translate(value))
@@ -129,185 +179,130 @@ def _(node: ast.JoinedStr) -> str:
     return f"format [\"{''.join(syntax)}\", {', '.join(formatted_value)}]"
 
 
-@translate.register
-def _(node: ast.List | ast.Tuple) -> str:
-    elems = ", ".join(translate(elem) for elem in node.elts)
+def _translate_list(node: ast.List | ast.Tuple) -> str:
+    elems = ", ".join(map(translate, node.elts))
     return f"[{elems}]"
 
 
-@translate.register
-def _(node: ast.Name) -> str:
-    return f"_{node.id}"
+# Local variable names, keyed by Python identifier. Bounded so that a huge
+# generated input can't grow it without limit.
+_NAME_CACHE: dict[str, str] = {}
+_NAME_CACHE_SIZE = 4096
 
 
-@translate.register
-def _(node: ast.Expr) -> str:
-    return f"{translate(node.value)};"
+def _translate_name(node: ast.Name) -> str:
+    name = _NAME_CACHE.get(node.id)
+    if name is None:
+        name = sys.intern(f"_{node.id}")
+        if len(_NAME_CACHE) < _NAME_CACHE_SIZE:
+            _NAME_CACHE[node.id] = name
+    return name
 
 
-@translate.register
-def _(node: ast.UnaryOp) -> str:
-    return f"{translate(node.op)}{translate(node.operand)}"
+def _translate_expr(node: ast.Expr) -> str:
+    return f"{translate(node.value)};"
 
 
-@translate.register
-def _(node: ast.Not) -> str:
-    return "!"
+def _translate_unaryop(node: ast.UnaryOp) -> str:
+    op = _OP_STR.get(type(node.op))
+    if op is None:
+        return _unsupported(node.op)
+    return f"{op}{translate(node.operand)}"
 
 
-@translate.register
-def _(node: ast.BinOp) -> str:
+def _translate_binop(node: ast.BinOp) -> str:
+    op = _OP_STR.get(type(node.op))
+    if op is None:
+        return _unsupported(node.op)
     # Ugly but correct.
     left = (
         f"({translate(node.left)})"
-        if isinstance(node.left, ast.BinOp)
+        if type(node.left) is ast.BinOp
         else translate(node.left)
     )
     right = (
         f"({translate(node.right)})"
-        if isinstance(node.right, ast.BinOp)
+        if type(node.right) is ast.BinOp
         else translate(node.right)
     )
-    return f"{left} {translate(node.op)} {right}"
-
-
-@translate.register
-def _(node: ast.Add) -> str:
-    return "+"
-
-
-@translate.register
-def _(node: ast.Sub) -> str:
-    return "-"
-
-
-@translate.register
-def _(node: ast.Mult) -> str:
-    return "*"
-
-
-@translate.register
-def _(node: ast.Div) -> str:
-    return "/"
-
-
-@translate.register
-def _(node: ast.FloorDiv) -> str:
-    return "/"
-
+    return f"{left} {op} {right}"
 
-@translate.register
-def _(node: ast.Mod) -> str:
-    return "mod"
 
+def _translate_boolop(node: ast.BoolOp) -> str:
+    op = _OP_STR.get(type(node.op))
+    if op is None:
+        return _unsupported(node.op)
+    return op.join(map(translate, node.values))
 
-@translate.register
-def _(node: ast.Pow) -> str:
-    return "^"
 
-
-@translate.register
-def _(node: ast.BoolOp) -> str:
-    return translate(node.op).join(translate(child) for child in node.values)
-
-
-@translate.register
-def _(node: ast.And) -> str:
-    return " && "
-
-
-@translate.register
-def _(node: ast.Or) -> str:
-    return " || "
-
-
-@translate.register
-def _(node: ast.Compare) -> str:
+def _translate_compare(node: ast.Compare) -> str:
     if len(node.comparators) != 1:
         log.warning("Unsupported compare: multiple compare is not supported!")
         return ""
-    return f"{translate(node.left)} {translate(node.ops[0])} {translate(node.comparators[0])}"
-
-
-@translate.register
-def _(node: ast.Eq) -> str:
-    return "=="
-
-
-@translate.register
-def _(node: ast.NotEq) -> str:
-    return "!="
-
-
-@translate.register
-def _(node: ast.Lt) -> str:
-    return "<"
-
-
-@translate.register
-def _(node: ast.LtE) -> str:
-    return "<="
-
-
-@translate.register
-def _(node: ast.Gt) -> str:
-    return ">"
-
+    op = _OP_STR.get(type(node.ops[0]))
+    if op is None:
+        return _unsupported(node.ops[0])
+    return f"{translate(node.left)} {op} {translate(node.comparators[0])}"
 
-@translate.register
-def _(node: ast.GtE) -> str:
-    return ">="
 
-
-@translate.register
-def _(node: ast.Call) -> str:
-    if len(node.keywords) != 0:
+def _translate_call(node: ast.Call) -> str:
+    if node.keywords:
         log.warning("Unsupported function call: keyword argument is not supported!")
         return ""
 
-    if any(isinstance(arg, ast.Starred) for arg in node.args):
+    if ast.Starred in map(type, node.args):
         log.warning("Unsupported function call: unpacking operator is not supported!")
         return ""
 
-    if isinstance(node.func, ast.Name):
+    if type(node.func) is ast.Name:
         if len(node.args) == 1:
             return f"{translate(node.args[0])} call {node.func.id}"
-        args = ", ".join(translate(arg) for arg in node.args)
+        args = ", ".join(map(translate, node.args))
         return f"[{args}] call {node.func.id}"
 
-    if isinstance(node.func, ast.Attribute):
+    if type(node.func) is ast.Attribute:
         if len(node.args) == 1:
             return f"{translate(node.func)} {translate(node.args[0])}"
-        args = ", ".join(translate(arg) for arg in node.args)
+        args = ", ".join(map(translate, node.args))
         return f"{translate(node.func)} [{args}]"
 
-    log.warning(f"Unsupported function call: {node.func} is not supported!")
+    log.warning("Unsupported function call: %s is not supported!", node.func)
     return ""
 
 
-@translate.register
-def _(node: ast.IfExp) -> str:
-    ifelse = Template("if ($condition) then {$ifbody} else {$elsebody};")
+def _translate_ifexp(node: ast.IfExp) -> str:
     condition = translate(node.test)
     ifbody = translate(node.body)
     elsebody = translate(node.orelse)
-    return ifelse.substitute(condition=condition, ifbody=ifbody, elsebody=elsebody)
+    return f"if ({condition}) then {{{ifbody}}} else {{{elsebody}}};"
 
 
-@translate.register
-def _(node: ast.Attribute) -> str:
-    # Special mark: GLOBAL
-    if isinstance(node.value, ast.Name) and node.value.id == "GLOBAL":
-        return node.attr
+def _translate_attribute(node: ast.Attribute) -> str:
+    if type(node.value) is ast.Name:
+        # Special mark: GLOBAL
+        if node.value.id == "GLOBAL":
+            return node.attr
+        # Plain `obj.attr`, the common case: skip dispatching on the receiver.
+        return f"_{node.value.id} {node.attr}"
     return f"{translate(node.value)} {node.attr}"
 
 
-@translate.register
-def _(node: ast.Subscript) -> str:
-    if isinstance(node.slice, ast.Constant):
-        return f"{translate(node.value)} select {node.slice.value}"
+def _is_index(value: object) -> bool:
+    # Parsing with `PyCF_OPTIMIZED_AST` also folds `a[1, 2]` and `a[-1]` into
+    # constant slices, and SQF has no equivalent for either.
+    if type(value) is tuple:
+        return False
+    return not (isinstance(value, (int, float)) and value < 0)
+
 
-    if isinstance(node.slice, ast.Slice):
+def _translate_subscript(node: ast.Subscript) -> str:
+    if type(node.slice) is ast.Constant:
+        if not _is_index(node.slice.value):
+            log.warning("Unsupported subscript: %s is not supported!", node.slice.value)
+            return ""
+        return f"{translate(node.value)} select {node.slice.value!s}"
+
+    if type(node.slice) is ast.Slice:
         if node.slice.step is not None:
             log.warning("Unsupported subscript: slice with step is not supported!")
             return ""
@@ -321,14 +316,19 @@ def _(node: ast.Subscript) -> str:
         assert isinstance(node.slice.lower, ast.Constant) and isinstance(
             node.slice.upper, ast.Constant
         )
-        return f"{translate(node.value)} select [{node.slice.lower.value}, {node.slice.upper.value - node.slice.lower.value}]"
+        lower = node.slice.lower.value
+        upper = node.slice.upper.value
+        if not (_is_index(lower) and _is_index(upper)):
+            log.warning("Unsupported subscript: %s is not supported!", node.slice)
+            return ""
+        count = upper - lower  # type: ignore
+        return f"{translate(node.value)} select [{lower!s}, {count}]"
 
     log.warning("Unsupported subscript: multiple slice is not supported!")
     return ""
 
 
-@translate.register
-def _(node: ast.Assign | ast.AnnAssign) -> str:
+def _translate_assign(node: ast.Assign | ast.AnnAssign) -> str:
     rhs = node.value
     if rhs is None:
         log.warning(
@@ -336,39 +336,46 @@ def _(node: ast.Assign | ast.AnnAssign) -> str:
         )
         return ""
 
+    # Translate once even when there are several targets (`a = b = rhs`).
+    value = translate(rhs)
+    targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+    # `lhs.ctx` must be `Store()` because it has `rhs`.
+    if len(targets) == 1 and type(targets[0]) is ast.Name:
+        return f"_{targets[0].id} = {value};"
+
     syntax: list[str] = []
-    # The type of `node.targets` is `list`.
-    for lhs in node.targets:  # type: ignore
-        if isinstance(lhs, ast.Name):
-            # `lhs.ctx` must be `Store()` because it has `rhs`.
-            syntax.append(f"_{lhs.id} = {translate(rhs)};")
-        elif isinstance(lhs, ast.Subscript):
-            if not isinstance(lhs.slice, ast.Constant):
-                log.warning(f"Unsupported assign: {lhs} is not supported!")
+    for lhs in targets:
+        if type(lhs) is ast.Name:
+            syntax.append(f"_{lhs.id} = {value};")
+        elif type(lhs) is ast.Subscript:
+            if type(lhs.slice) is not ast.Constant or not _is_index(lhs.slice.value):
+                log.warning("Unsupported assign: %s is not supported!", lhs)
                 return ""
             index = lhs.slice.value
-            syntax.append(f"{translate(node.value)} set [{index}, {translate(rhs)}]")
+            syntax.append(f"{translate(lhs.value)} set [{index!s}, {value}];")
         else:
-            log.warning(f"Unsupported assign: {lhs} is not supported!")
+            log.warning("Unsupported assign: %s is not supported!", lhs)
             return ""
     return "".join(syntax)
 
 
-@translate.register
-def _(node: ast.AugAssign) -> str:
+def _translate_augassign(node: ast.AugAssign) -> str:
     # `lhs.ctx` must be `Store()` because it must have `rhs`.
     lhs = node.target
     assert isinstance(lhs, ast.Name)
-    return f"_{lhs.id} = _{lhs.id} {translate(node.op)} {translate(node.value)};"
+    name = _translate_name(lhs)
+    op = _OP_STR.get(type(node.op))
+    if op is None:
+        return _unsupported(node.op)
+    return f"{name} = {name} {op} {translate(node.value)};"
 
 
-@translate.register
-def _(node: ast.Delete) -> str:
+def _translate_delete(node: ast.Delete) -> str:
     syntax: list[str] = []
     for target in node.targets:
         if not isinstance(target, ast.Name):
             log.warning(
-                f"Unsupported delete: Deleting a non-name target is not supported!"
+                "Unsupported delete: Deleting a non-name target is not supported!"
             )
             return ""
 
@@ -376,28 +383,17 @@ def _(node: ast.Delete) -> str:
     return "".join(syntax)
 
 
-@translate.register
-def _(node: ast.Pass) -> str:
-    return ""
-
-
-@translate.register
-def _(node: ast.If) -> str:
-    if len(node.orelse) != 0:
-        ifelse = Template("if ($condition) then {$ifbody} else {$elsebody};")
-        condition = translate(node.test)
-        ifbody = "".join(translate(child) for child in node.body)
-        elsebody = "".join(translate(child) for child in node.orelse)
-        return ifelse.substitute(condition=condition, ifbody=ifbody, elsebody=elsebody)
-    pureif = Template("if ($condition) then {$body};")
+def _translate_if(node: ast.If) -> str:
     condition = translate(node.test)
-    body = "".join(translate(child) for child in node.body)
-    return pureif.substitute(condition=condition, body=body)
+    body = "".join(map(translate, node.body))
+    if node.orelse:
+        elsebody = "".join(map(translate, node.orelse))
+        return f"if ({condition}) then {{{body}}} else {{{elsebody}}};"
+    return f"if ({condition}) then {{{body}}};"
 
 
-@translate.register
-def _(node: ast.For) -> str:
-    if len(node.orelse) != 0:
+def _translate_for(node: ast.For) -> str:
+    if node.orelse:
         log.warning("Unsupported or-else: else after for is not supported!")
         return ""
 
@@ -407,8 +403,10 @@ def _(node: ast.For) -> str:
         and isinstance(node.iter.func, ast.Name)
         and node.iter.func.id == "range"
     ):
-        forrange = Template('for "$val" from $start to $stop step $step do{$body};')
-        assert all(isinstance(arg, ast.Constant) for arg in node.iter.args)
+        # Check that every argument is a constant and collect the values in
+        # the same pass.
+        args = [arg.value for arg in node.iter.args if type(arg) is ast.Constant]
+        assert len(args) == len(node.iter.args)
         if not isinstance(node.target, ast.Name):
             log.warning(
                 "Unsupported variable: for-range loop can only have one variable!"
@@ -416,81 +414,125 @@ def _(node: ast.For) -> str:
             return ""
 
         val = f"_{node.target.id}"
-        start = stop = 0
-        step = 1
-        # The type of `node.iter.args` is `list[ast.Constant]`.
-        args: list[ast.Constant] = node.iter.args  # type: ignore
-        match len(args):
-            case 1:
-                stop = args[0].value
-            case 2:
-                start, stop = (arg.value for arg in args)
-            case 3:
-                start, stop, step = (arg.value for arg in args)
-            case _:
-                log.error("Unknown arguments!")
-        body = "".join(translate(child) for child in node.body)
-        return forrange.substitute(
-            val=val, start=start, stop=stop, step=step, body=body
-        )
+        start: object = 0
+        stop: object = 0
+        step: object = 1
+        if len(args) == 1:
+            stop = args[0]
+        elif len(args) == 2:
+            start = args[0]
+            stop = args[1]
+        elif len(args) == 3:
+            start = args[0]
+            stop = args[1]
+            step = args[2]
+        else:
+            log.error("Unknown arguments!")
+        body = "".join(map(translate, node.body))
+        return f'for "{val}" from {start} to {stop} step {step} do{{{body}}};'
 
-    foreach = Template("{$target;$body} forEach $iter;")
     if not isinstance(node.target, ast.Name):
         log.warning("Unsuppoted target: no-name target is not supported!")
         return ""
 
     var = node.target.id
     target = f"private _{var} = _x" if var != "x" else ""
-    body = "".join(translate(child) for child in node.body)
+    body = "".join(map(translate, node.body))
     iter = translate(node.iter)
-    return foreach.substitute(target=target, body=body, iter=iter)
+    return f"{{{target};{body}}} forEach {iter};"
 
 
-@translate.register
-def _(node: ast.While) -> str:
-    if len(node.orelse) != 0:
+def _translate_while(node: ast.While) -> str:
+    if node.orelse:
         log.warning("Unsupported or-else: else after while is not supported!")
         return ""
-    whileloop = Template("while {$condition} do {$body};")
     condition = translate(node.test)
-    body = "".join(translate(child) for child in node.body)
-    return whileloop.substitute(condition=condition, body=body)
-
-
-@translate.register
-def _(node: ast.Break) -> str:
-    return "break;"
+    body = "".join(map(translate, node.body))
+    return f"while {{{condition}}} do {{{body}}};"
 
 
-@translate.register
-def _(node: ast.Continue) -> str:
-    return "continue;"
-
-
-@translate.register
-def _(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+def _translate_functiondef(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
     # TODO: Add default arguments support.
-    if len(node.args.kwonlyargs) != 0 or len(node.args.defaults) != 0:
+    if node.args.kwonlyargs or node.args.defaults:
         log.warning(
             "Unsupport function arguments: keyword only and default arguments are not supported!"
         )
         return ""
 
-    if len(node.decorator_list) != 0:
+    if node.decorator_list:
         log.warning("Unsupport function: function with decorator is not supported!")
         return ""
 
-    func = Template("$funcname = {params [$args];$body};")
-    args = ", ".join(f'"_{arg.arg}"' for arg in node.args.args)
-    body = "".join(translate(child) for child in node.body)
-    return func.substitute(funcname=node.name, args=args, body=body)
+    args = ", ".join([f'"_{arg.arg}"' for arg in node.args.args])
+    body = "".join(map(translate, node.body))
+    return f"{node.name} = {{params [{args}];{body}}};"
 
 
-@translate.register
-def _(node: ast.Return) -> str:
+def _translate_return(node: ast.Return) -> str:
     return f"{translate(node.value)}" if node.value is not None else ""
 
 
-@translate.register
-def _(node: ast.Await) -> str:
+def _translate_await(node: ast.Await) -> str:
     return f"waitUntil {{{translate(node.value)}}}"
+
+
+# `translate` dispatches on the exact node type, so every member of a union
+# needs its own entry. Nodes that always produce the same text map straight
+# to that string.
+TRANSLATORS: dict[type[ast.AST], str | Callable[..., str]] = {
+    ast.Module: _translate_module,
+    ast.Interactive: _translate_module,
+    ast.Expression: _translate_expression,
+    ast.FunctionType: "",
+    ast.Constant: _translate_constant,
+    ast.FormattedValue: _translate_formattedvalue,
+    ast.JoinedStr: _translate_joinedstr,
+    ast.List: _translate_list,
+    ast.Tuple: _translate_list,
+    ast.Name: _translate_name,
+    ast.Expr: _translate_expr,
+    ast.UnaryOp: _translate_unaryop,
+    ast.BinOp: _translate_binop,
+    ast.BoolOp: _translate_boolop,
+    ast.Compare: _translate_compare,
+    ast.Call: _translate_call,
+    ast.IfExp: _translate_ifexp,
+    ast.Attribute: _translate_attribute,
+    ast.Subscript: _translate_subscript,
+    ast.Assign: _translate_assign,
+    ast.AnnAssign: _translate_assign,
+    ast.AugAssign: _translate_augassign,
+    ast.Delete: _translate_delete,
+    ast.Pass: "",
+    ast.If: _translate_if,
+    ast.For: _translate_for,
+    ast.While: _translate_while,
+    ast.Break: _BREAK,
+    ast.Continue: _CONTINUE,
+    ast.FunctionDef: _translate_functiondef,
+    ast.AsyncFunctionDef: _translate_functiondef,
+    ast.Return: _translate_return,
+    ast.Await: _translate_await,
+}
+
+
+# Operators are leaves, so they are looked up here instead of going through
+# `translate`.
+_OP_STR: dict[type[ast.AST], str] = {
+    ast.Add: "+",
+    ast.Sub: "-",
+    ast.Mult: "*",
+    ast.Div: "/",
+    ast.FloorDiv: "/",
+    ast.Mod: "mod",
+    ast.Pow: "^",
+    ast.And: " && ",
+    ast.Or: " || ",
+    ast.Not: "!",
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+}